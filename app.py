@@ -1,25 +1,83 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import Body, FastAPI, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response
 import uvicorn
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 import asyncio
-from typing import Dict, Any, Optional
+import os
+from typing import Annotated, Dict, Any, Literal, Optional, Union
 import logging
 
 from browser import BrowserController
 from error_handler import BrowserAutomationError, handle_error
+from parser import parse_command
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Browser Automation Agent API")
+app = FastAPI(title="Browser Automation Agent API", default_response_class=ORJSONResponse)
 
 class CommandRequest(BaseModel):
     command: str
     options: Optional[Dict[str, Any]] = None
 
+# Structured actions, validated in one pass by dispatching on "action"
+class ActionModel(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    # Load BLOCKED_RESOURCE_TYPES during this action (e.g. the navigation
+    # before a screenshot)
+    need_render: bool = False
+
+LoadState = Literal["commit", "domcontentloaded", "load", "networkidle"]
+
+class NavigateAction(ActionModel):
+    action: Literal["navigate"]
+    url: str
+    wait_until: LoadState = "domcontentloaded"
+
+class ClickAction(ActionModel):
+    action: Literal["click"]
+    text: str
+
+class TypeAction(ActionModel):
+    action: Literal["type"]
+    text: str
+    field: str
+    human_like: bool = False
+
+class SubmitAction(ActionModel):
+    action: Literal["submit"]
+    wait_until: LoadState = "domcontentloaded"
+
+class WaitAction(ActionModel):
+    action: Literal["wait"]
+    seconds: float
+
+class WaitForElementAction(ActionModel):
+    action: Literal["wait_for_element"]
+    element: str
+    timeout: int = 30000
+
+class ScreenshotAction(ActionModel):
+    action: Literal["screenshot"]
+
+class LoginAction(ActionModel):
+    action: Literal["login"]
+    website: str
+    username: Optional[str] = None
+    password: Optional[str] = None
+
+class SearchAction(ActionModel):
+    action: Literal["search"]
+    query: str
+    website: str
+
+ActionRequest = Union[
+    NavigateAction, ClickAction, TypeAction, SubmitAction, WaitAction,
+    WaitForElementAction, ScreenshotAction, LoginAction, SearchAction
+]
+
 class CommandResponse(BaseModel):
     success: bool
     message: str
@@ -28,6 +86,10 @@ class CommandResponse(BaseModel):
 # Global browser controller instance
 browser_controller = None
 
+# Constant response bodies, encoded once for probe traffic
+HEALTH_BYTES = b'{"status":"healthy"}'
+NOT_INITIALIZED_BYTES = b'{"status":"not_initialized"}'
+
 @app.on_event("startup")
 async def startup_event():
     global browser_controller
@@ -42,34 +104,23 @@ async def shutdown_event():
         await browser_controller.close()
         logger.info("Browser controller shut down")
 
-@app.post("/interact", response_model=CommandResponse)
-async def interact(request: CommandRequest):
+async def run_action(action: str, parameters: Dict[str, Any], description: str) -> CommandResponse:
+    """Execute an action on the browser controller and wrap the outcome."""
     global browser_controller
     
     if not browser_controller:
         raise HTTPException(status_code=500, detail="Browser controller not initialized")
     
     try:
-        # Parse the natural language command
-        # Note: You mentioned you already have the parser implemented
-        from parser import parse_command
-        action, parameters = parse_command(request.command)
-        
-        # Apply any additional options provided in the request
-        if request.options:
-            parameters.update(request.options)
-        
-        # Execute the command
         result = await browser_controller.execute(action, parameters)
         
         return CommandResponse(
             success=True,
-            message=f"Successfully executed: {request.command}",
+            message=f"Successfully executed: {description}",
             data=result
         )
         
     except BrowserAutomationError as e:
-        logger.error(f"Browser automation error: {str(e)}")
         error_response = handle_error(e)
         return CommandResponse(
             success=False,
@@ -80,10 +131,33 @@ async def interact(request: CommandRequest):
         logger.error(f"Unexpected error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+@app.post("/interact", response_model=CommandResponse)
+async def interact(request: Annotated[ActionRequest, Body(discriminator="action")]):
+    """Execute a structured action, e.g. {"action": "navigate", "url": "github.com"}."""
+    parameters = request.model_dump(exclude={"action"})
+    return await run_action(request.action, parameters, request.action)
+
+@app.post("/interact/nl", response_model=CommandResponse)
+async def interact_nl(request: CommandRequest):
+    """Parse a natural language command and execute it."""
+    try:
+        # Parse the natural language command
+        action, parameters = parse_command(request.command)
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+    
+    # Apply any additional options provided in the request; the parsed
+    # parameters are read-only, so merge into a new dict
+    if request.options:
+        parameters = {**parameters, **request.options}
+    
+    return await run_action(action, parameters, request.command)
+
 @app.exception_handler(BrowserAutomationError)
 async def browser_error_handler(request: Request, exc: BrowserAutomationError):
     error_response = handle_error(exc)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={"success": False, "message": str(exc), "data": error_response}
     )
@@ -92,7 +166,7 @@ async def browser_error_handler(request: Request, exc: BrowserAutomationError):
 async def get_status():
     global browser_controller
     if not browser_controller:
-        return {"status": "not_initialized"}
+        return Response(content=NOT_INITIALIZED_BYTES, media_type="application/json")
     
     try:
         browser_status = await browser_controller.get_status()
@@ -107,28 +181,56 @@ async def get_status():
             "message": str(e)
         }
 
+@app.get("/screenshot")
+async def get_screenshot(quality: Annotated[int, Query(ge=0, le=100)] = 70):
+    """Return a JPEG screenshot of the current page as raw bytes."""
+    global browser_controller
+    if not browser_controller:
+        raise HTTPException(status_code=500, detail="Browser controller not initialized")
+    
+    image = await browser_controller.take_screenshot(quality=quality)
+    return Response(content=image, media_type="image/jpeg")
+
 @app.get("/health")
 async def health_check():
     """Simple health check endpoint."""
-    return {"status": "healthy"}
+    return Response(content=HEALTH_BYTES, media_type="application/json")
 
 @app.post("/reset")
 async def reset_browser():
-    """Reset the browser controller (close and reinitialize)."""
+    """
+    Reset the browser controller (recreate its browser contexts).
+    
+    The reset runs in the background; requests sent meanwhile wait for it.
+    """
     global browser_controller
     try:
-        if browser_controller:
-            await browser_controller.close()
-            logger.info("Browser controller closed")
+        if not browser_controller:
+            browser_controller = BrowserController()
         
-        browser_controller = BrowserController()
-        await browser_controller.initialize()
-        logger.info("Browser controller reinitialized")
+        browser_controller.schedule_reset()
+        logger.info("Browser controller reset scheduled")
         
-        return {"status": "success", "message": "Browser reset successfully"}
+        return {"status": "resetting", "message": "Browser reset scheduled"}
     except Exception as e:
         logger.error(f"Error resetting browser: {str(e)}")
         return {"status": "error", "message": str(e)}
 
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    if os.getenv("APP_ENV") == "dev":
+        # Auto-reload on code changes during development
+        uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # One worker by default: browser state lives in the worker, so
+        # multi-step flows and /reset only work if every request hits it
+        workers = int(os.getenv("WEB_CONCURRENCY", 1))
+        uvicorn.run(
+            "app:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=workers,
+            access_log=False,
+            proxy_headers=True
+        )
@@ -1,8 +1,14 @@
 #browser.py
-from playwright.async_api import async_playwright, Page, Browser, ElementHandle
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, ElementHandle
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import asyncio
+import glob
+import json
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, List, Optional, Set, Tuple
+from urllib.parse import quote, urlsplit
 import base64
 from error_handler import (
     BrowserAutomationError, 
@@ -13,69 +19,359 @@ from error_handler import (
 
 logger = logging.getLogger(__name__)
 
+# Number of browser contexts (tabs) kept open per worker. Requests are not
+# tied to a context, so commands from one client only land on the page its
+# previous command loaded when there is a single tab. Raise it only to serve
+# independent, single-shot requests concurrently.
+DEFAULT_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 1))
+
+# Artificial delay between Playwright operations, for debugging only
+DEFAULT_SLOW_MO = int(os.getenv("PLAYWRIGHT_SLOW_MO", 0))
+
+# WebSocket endpoint of a shared Chromium (see launch_chromium.py); when set,
+# workers connect to it instead of launching their own browser
+CDP_ENDPOINT = os.getenv("CDP_ENDPOINT")
+
+# Attribute-based strategies for locating a fillable element by identifier,
+# joined into one selector list so the page can resolve all of them in a
+# single query
+FIELD_SELECTOR_TEMPLATE = ", ".join([
+    "[placeholder*='{id}' i]",
+    "input[name*='{id}' i]",
+    "input[id*='{id}' i]",
+    "input[aria-label*='{id}' i]",
+    "textarea[name*='{id}' i]",
+    "textarea[id*='{id}' i]",
+    "textarea[aria-label*='{id}' i]"
+])
+
+# Lowest-priority strategies, only tried when no field or label matches, so
+# e.g. an "Email us" link never wins over an email input
+TEXT_SELECTOR_TEMPLATE = ", ".join([
+    "button:has-text('{id}')",
+    "a:has-text('{id}')"
+])
+
+# Load state to wait for after navigation. "networkidle" needs 500ms without
+# any network traffic, which pages with telemetry beacons may never reach.
+DEFAULT_WAIT_STATE = "domcontentloaded"
+
+# Load states reached before subresources finish loading; need_render raises
+# them to "load", since blocking resumes as soon as the action returns
+EARLY_WAIT_STATES = ("commit", "domcontentloaded")
+
+# Candidate submit buttons, in one selector list
+SUBMIT_SELECTOR = ", ".join([
+    "input[type='submit']",
+    "button[type='submit']",
+    "button:has-text('Submit')",
+    "button:has-text('Login')",
+    "button:has-text('Sign in')",
+    "button:has-text('Search')",
+    "button:has-text('Send')"
+])
+
+# Resolves a label containing the text to its associated input (via "for" or
+# nesting), falling back to the label itself; null if no label matches
+FIND_BY_LABEL_JS = """(text) => {
+    const needle = text.toLowerCase();
+    const label = [...document.querySelectorAll('label')].find(
+        l => l.textContent.toLowerCase().includes(needle)
+    );
+    if (!label) return null;
+    return (label.htmlFor && document.getElementById(label.htmlFor))
+        || label.querySelector('input')
+        || label;
+}"""
+
+# Resource types aborted while an action does not need the page rendered
+# (comma-separated Playwright resource types). Off by default: blocked
+# resources stay missing from later screenshots, and routing every request
+# through Python bypasses the HTTP cache.
+# Stylesheets should be kept: without them hidden elements would look visible.
+BLOCKED_RESOURCE_TYPES = frozenset(
+    t.strip() for t in os.getenv("BLOCKED_RESOURCE_TYPES", "").split(",") if t.strip()
+)
+
+# Directory where logged-in sessions (cookies, local storage) are kept per site
+STATE_DIR = os.getenv("BROWSER_STATE_DIR", ".states")
+
+# Link texts that indicate the page is still offering a login
+LOGIN_LINK_TEXTS = ["Log in", "Login", "Sign in", "Signin", "Sign In"]
+
+# True when the page shows neither a password field nor a login link
+LOGGED_IN_JS = """(texts) => !document.querySelector("input[type='password']")
+    && ![...document.querySelectorAll('a, button')].some(el => texts.includes(el.textContent.trim()))"""
+
+# Returns a selector that uniquely identifies the element (by id or name), or null
+STABLE_SELECTOR_JS = """(el) => {
+    let selector = null;
+    if (el.id) {
+        selector = `#${CSS.escape(el.id)}`;
+    } else if (el.getAttribute('name')) {
+        selector = `${el.tagName.toLowerCase()}[name="${CSS.escape(el.getAttribute('name'))}"]`;
+    }
+    return selector && document.querySelectorAll(selector).length === 1 ? selector : null;
+}"""
+
+def _quote_css(value: str) -> str:
+    """Escape a value for use inside a single-quoted CSS string."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+def _site_host(website: str) -> str:
+    """Return the host name of a website, without a leading "www."."""
+    if not website.startswith(('http://', 'https://')):
+        website = f"https://{website}"
+    host = (urlsplit(website).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+def _state_path(host: str, username: str) -> str:
+    """Return the file holding the saved session of a user on a site."""
+    return os.path.join(STATE_DIR, f"{host}@{quote(username, safe='')}.json")
+
+def _latest_state_path(host: str) -> Optional[str]:
+    """Return the most recently saved session for a site, or None."""
+    paths = glob.glob(os.path.join(glob.escape(STATE_DIR), f"{glob.escape(host)}@*.json"))
+    return max(paths, key=os.path.getmtime) if paths else None
+
+def _on_site(domain: Optional[str], host: str) -> bool:
+    """Whether a cookie domain or origin host belongs to the site."""
+    domain = (domain or "").lstrip(".").lower()
+    return bool(domain) and (
+        domain == host or domain.endswith(f".{host}") or host.endswith(f".{domain}")
+    )
+
 class BrowserController:
-    def __init__(self, headless: bool = False, slow_mo: int = 50):
+    def __init__(self, headless: bool = False, slow_mo: int = DEFAULT_SLOW_MO, pool_size: Optional[int] = None):
         """
         Initialize the browser controller.
         
         Args:
             headless: Whether to run the browser in headless mode
             slow_mo: Slow down operations by this many milliseconds
+                (defaults to PLAYWRIGHT_SLOW_MO or 0)
+            pool_size: Number of browser contexts to keep in the pool
+                (defaults to BROWSER_POOL_SIZE or 1)
         """
         self.headless = headless
         self.slow_mo = slow_mo
+        self.pool_size = max(1, pool_size or DEFAULT_POOL_SIZE)
         self.playwright = None
         self.browser = None
-        self.context = None
-        self.page = None
+        self._contexts: List[BrowserContext] = []
+        # LIFO so that sequential requests keep landing on the same warm tab,
+        # while concurrent requests each get their own context. With more
+        # than one context, overlapping clients can still land on each
+        # other's tabs, which is why the pool is opt-in.
+        self._pool: "asyncio.LifoQueue[BrowserContext]" = asyncio.LifoQueue()
+        self._last_page: Optional[Page] = None
+        # Per-page map of (identifier, fillable) -> selector that last resolved it
+        self._selector_caches: Dict[Page, Dict[Tuple[str, bool], str]] = {}
+        # Contexts whose current action needs every resource loaded
+        self._rendering: Set[BrowserContext] = set()
+        # Background reset started by schedule_reset(), awaited by new requests
+        self._resetting: Optional[asyncio.Task] = None
+        # Serializes initialize() so concurrent callers start one browser
+        self._init_lock = asyncio.Lock()
         self.initialized = False
     
+    @property
+    def page(self) -> Optional[Page]:
+        """The most recently used page (the one the next request will reuse)."""
+        return self._last_page
+    
     async def initialize(self):
-        """Initialize the browser."""
-        if self.initialized:
-            return
+        """
+        Initialize the browser.
+        
+        Concurrent callers (e.g. requests arriving after a failed reset) are
+        serialized, so only one of them starts a browser.
+        """
+        async with self._init_lock:
+            if self.initialized:
+                return
+            
+            try:
+                self.playwright = await async_playwright().start()
+                if CDP_ENDPOINT:
+                    logger.info(f"Connecting to shared browser at {CDP_ENDPOINT}")
+                    self.browser = await self.playwright.chromium.connect_over_cdp(
+                        CDP_ENDPOINT,
+                        slow_mo=self.slow_mo
+                    )
+                else:
+                    self.browser = await self.playwright.chromium.launch(
+                        headless=self.headless,
+                        slow_mo=self.slow_mo
+                    )
+                await self._fill_pool()
+                self.initialized = True
+                logger.info(f"Browser initialized successfully with {self.pool_size} contexts in worker {os.getpid()}")
+            except Exception as e:
+                logger.error(f"Failed to initialize browser: {str(e)}")
+                await self.close()
+                raise BrowserAutomationError(f"Browser initialization failed: {str(e)}")
+    
+    async def _new_context(self) -> BrowserContext:
+        """Create a browser context with a single open page."""
+        context = await self.browser.new_context(
+            viewport={"width": 1280, "height": 800},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+        )
+        context.on("page", self._watch_page)
+        if BLOCKED_RESOURCE_TYPES:
+            await context.route("**/*", lambda route: self._route_request(context, route))
+        await context.new_page()
+        return context
+    
+    async def _route_request(self, context: BrowserContext, route):
+        """Abort non-essential resources unless the current action needs rendering."""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES and context not in self._rendering:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    def _watch_page(self, page: Page):
+        """Give a page its own selector cache, cleared whenever its main frame navigates."""
+        cache: Dict[Tuple[str, bool], str] = {}
+        self._selector_caches[page] = cache
+        page.on("framenavigated", lambda frame: cache.clear() if frame == page.main_frame else None)
+        page.on("close", lambda _: self._selector_caches.pop(page, None))
+    
+    async def _fill_pool(self):
+        """Create pool_size fresh contexts and make them available to requests."""
+        for _ in range(self.pool_size):
+            context = await self._new_context()
+            self._contexts.append(context)
+            self._pool.put_nowait(context)
+        self._last_page = self._contexts[-1].pages[0]
+    
+    async def _drain_pool(self):
+        """
+        Retire every context owned by this controller.
         
+        Idle contexts are closed now. Contexts leased by in-flight requests
+        are left running and closed by _acquire when they are released, since
+        they no longer belong to self._contexts.
+        """
+        idle = []
+        while not self._pool.empty():
+            idle.append(self._pool.get_nowait())
+        
+        self._contexts = []
+        self._selector_caches = {}
+        self._last_page = None
+        
+        for context in idle:
+            await self._close_context(context)
+    
+    async def _close_context(self, context: BrowserContext):
+        """Close a retired context, ignoring errors (e.g. the browser is gone)."""
         try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                slow_mo=self.slow_mo
-            )
-            self.context = await self.browser.new_context(
-                viewport={"width": 1280, "height": 800},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
-            )
-            self.page = await self.context.new_page()
-            self.initialized = True
-            logger.info("Browser initialized successfully")
+            await context.close()
         except Exception as e:
-            logger.error(f"Failed to initialize browser: {str(e)}")
-            await self.close()
-            raise BrowserAutomationError(f"Browser initialization failed: {str(e)}")
+            logger.warning(f"Error closing browser context: {str(e)}")
+    
+    @asynccontextmanager
+    async def _acquire(self, need_render: bool = False) -> AsyncIterator[Page]:
+        """
+        Lease a context from the pool for the duration of one action.
+        
+        Args:
+            need_render: Load BLOCKED_RESOURCE_TYPES while the lease is held
+        """
+        context = await self._pool.get()
+        if need_render:
+            self._rendering.add(context)
+        try:
+            page = context.pages[0] if context.pages else await context.new_page()
+            self._last_page = page
+            yield page
+        finally:
+            self._rendering.discard(context)
+            if context in self._contexts:
+                self._pool.put_nowait(context)
+            else:
+                # Retired by a reset while leased; never hand it out again
+                await self._close_context(context)
     
     async def close(self):
-        """Close the browser and all resources."""
+        """
+        Close the browser and all resources.
+        
+        The controller is always left uninitialized, even if the browser has
+        crashed or the CDP connection is gone, so initialize() can start over.
+        """
         try:
-            if self.page:
-                await self.page.close()
-                self.page = None
-            
-            if self.context:
-                await self.context.close()
-                self.context = None
+            await self._drain_pool()
             
             if self.browser:
                 await self.browser.close()
-                self.browser = None
-            
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
-            
-            self.initialized = False
             logger.info("Browser closed successfully")
         except Exception as e:
             logger.error(f"Error during browser close: {str(e)}")
+        finally:
+            self.browser = None
+            if self.playwright:
+                try:
+                    await self.playwright.stop()
+                except Exception as e:
+                    logger.error(f"Error stopping Playwright: {str(e)}")
+                self.playwright = None
+            self.initialized = False
+    
+    async def reset(self):
+        """
+        Discard all browsing state by recreating the contexts.
+        
+        The browser process itself (or the CDP connection) is kept, which
+        makes a reset much cheaper than close() followed by initialize().
+        If the browser has crashed or the connection dropped, or the contexts
+        cannot be recreated, the whole browser is restarted instead.
+        """
+        if not self.initialized:
+            await self.initialize()
+            return
+        
+        if self.browser.is_connected():
+            try:
+                await self._drain_pool()
+                await self._fill_pool()
+                logger.info("Browser contexts reset successfully")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to reset browser contexts, restarting browser: {str(e)}")
+        else:
+            logger.warning("Browser disconnected, restarting browser")
+        
+        await self.close()
+        await self.initialize()
+        logger.info("Browser restarted successfully")
+    
+    def schedule_reset(self):
+        """
+        Start reset() in the background and return immediately.
+        
+        Requests that arrive while the reset is running wait for it to
+        finish before leasing a context.
+        """
+        if self._resetting is None:
+            self._resetting = asyncio.create_task(self.reset())
+            self._resetting.add_done_callback(self._reset_done)
+    
+    def _reset_done(self, task: asyncio.Task):
+        """Clear the pending reset once it has finished."""
+        self._resetting = None
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background browser reset failed: {str(task.exception())}")
+    
+    async def _ensure_ready(self):
+        """Wait for a pending reset and make sure the browser is initialized."""
+        if self._resetting is not None:
+            await asyncio.shield(self._resetting)
+        
+        if not self.initialized:
+            await self.initialize()
     
     async def get_status(self) -> Dict[str, Any]:
         """Get the current status of the browser."""
@@ -83,11 +379,11 @@ class BrowserController:
             return {"status": "not_initialized"}
         
         try:
-            current_url = await self.page.url()
+            meta = await self._page_meta(self.page)
             return {
                 "status": "ready",
-                "current_url": current_url,
-                "title": await self.page.title()
+                "current_url": meta["url"],
+                "title": meta["title"]
             }
         except Exception as e:
             logger.error(f"Error getting browser status: {str(e)}")
@@ -99,7 +395,9 @@ class BrowserController:
         
         Args:
             action: The action to execute
-            parameters: The parameters for the action
+            parameters: The parameters for the action, optionally including
+                need_render to load BLOCKED_RESOURCE_TYPES for this action
+                (navigate and submit then wait for at least "load")
             
         Returns:
             A dictionary with the result of the action
@@ -107,8 +405,7 @@ class BrowserController:
         Raises:
             BrowserAutomationError: If the action fails
         """
-        if not self.initialized:
-            await self.initialize()
+        await self._ensure_ready()
         
         # Map actions to methods
         action_map = {
@@ -126,8 +423,15 @@ class BrowserController:
         if action not in action_map:
             raise BrowserAutomationError(f"Unknown action: {action}")
         
+        parameters = dict(parameters)
+        need_render = parameters.pop("need_render", False)
+        if need_render and action in ("navigate", "submit"):
+            if parameters.get("wait_until", DEFAULT_WAIT_STATE) in EARLY_WAIT_STATES:
+                parameters["wait_until"] = "load"
+        
         try:
-            result = await action_map[action](**parameters)
+            async with self._acquire(need_render=need_render) as page:
+                result = await action_map[action](page, **parameters)
             return result
         except BrowserAutomationError:
             # Re-raise specific browser errors
@@ -136,33 +440,87 @@ class BrowserController:
             logger.error(f"Error executing action {action}: {str(e)}", exc_info=True)
             raise BrowserAutomationError(f"Failed to execute {action}: {str(e)}")
     
-    async def _navigate(self, url: str) -> Dict[str, Any]:
-        """Navigate to a URL."""
+    async def take_screenshot(self, image_type: str = "jpeg", quality: Optional[int] = 70) -> bytes:
+        """
+        Take a screenshot of the current page and return the raw image bytes.
+        
+        Args:
+            image_type: Image format, "jpeg" or "png"
+            quality: JPEG quality (ignored for PNG)
+            
+        Returns:
+            The encoded image
+            
+        Raises:
+            BrowserAutomationError: If the screenshot fails
+        """
+        await self._ensure_ready()
+        
+        try:
+            async with self._acquire() as page:
+                if image_type == "png":
+                    return await page.screenshot(type="png")
+                return await page.screenshot(type="jpeg", quality=quality)
+        except Exception as e:
+            logger.error(f"Screenshot error: {str(e)}")
+            raise BrowserAutomationError(f"Failed to take screenshot: {str(e)}")
+    
+    async def save_screenshot(self, path: str):
+        """
+        Save a PNG screenshot of the current page to a file.
+        
+        Playwright writes the file directly, so the image is never base64
+        encoded. This is for local scripts such as the demos and is
+        deliberately not an action, so API clients cannot choose the path.
+        
+        Args:
+            path: File to write the screenshot to
+            
+        Raises:
+            BrowserAutomationError: If the screenshot fails
+        """
+        await self._ensure_ready()
+        
+        try:
+            async with self._acquire() as page:
+                await page.screenshot(path=path)
+        except Exception as e:
+            logger.error(f"Screenshot error: {str(e)}")
+            raise BrowserAutomationError(f"Failed to save screenshot to {path}: {str(e)}")
+    
+    async def _page_meta(self, page: Page) -> Dict[str, str]:
+        """Fetch the page URL and title in a single round-trip."""
+        return await page.evaluate("() => ({url: location.href, title: document.title})")
+    
+    async def _navigate(self, page: Page, url: str, wait_until: str = DEFAULT_WAIT_STATE) -> Dict[str, Any]:
+        """
+        Navigate to a URL.
+        
+        Args:
+            url: The URL to open
+            wait_until: Load state to wait for; pass "networkidle" only when
+                all resources need to settle (e.g. before a screenshot)
+        """
         try:
             # Add protocol if not present
             if not url.startswith(('http://', 'https://')):
                 url = f"https://{url}"
             
             logger.info(f"Navigating to: {url}")
-            # Fix: Use proper wait_until value
-            # await self.page.goto(url, wait_until="networkidle")
-            # Alternative approach if the above doesn't work:
-            await self.page.goto(url)
-            await self.page.wait_for_load_state("networkidle")
-            return {
-                "url":  self.page.url,
-                "title": await self.page.title()
-            }
+            await page.goto(url, wait_until=wait_until, timeout=15000)
+            return await self._page_meta(page)
         except Exception as e:
             logger.error(f"Navigation error to {url}: {str(e)}")
             raise NavigationError(f"Failed to navigate to {url}: {str(e)}")
-    async def _find_element(self, identifier, timeout=5000) -> ElementHandle:
+    
+    async def _find_element(self, page: Page, identifier, timeout=5000, fillable=False) -> ElementHandle:
         """
         Find an element using various strategies.
         
         Args:
             identifier: Text, selector, or field name to find
             timeout: Timeout in milliseconds
+            fillable: Only match inputs and textareas (by attribute or label)
             
         Returns:
             ElementHandle if found
@@ -171,71 +529,23 @@ class BrowserController:
             ElementNotFoundError: If the element is not found
         """
         try:
-            # Try by text
-            try:
-                element = await self.page.wait_for_selector(
-                    f"text='{identifier}'",
-                    timeout=timeout
-                )
-                if element:
-                    return element
-            except:
-                pass
+            cache = self._selector_caches.get(page)
+            key = (identifier, fillable)
             
-            # Try by placeholder
-            try:
-                element = await self.page.wait_for_selector(
-                    f"[placeholder*='{identifier}' i]",
-                    timeout=timeout
-                )
+            # Reuse the selector that resolved this identifier earlier on the page
+            if cache and key in cache:
+                element = await page.query_selector(f"{cache[key]} >> visible=true")
                 if element:
                     return element
-            except:
-                pass
+                del cache[key]
             
-            # Try by label
-            try:
-                element = await self.page.wait_for_selector(
-                    f"label:has-text('{identifier}')",
-                    timeout=timeout
-                )
-                if element:
-                    # Find the input associated with this label
-                    label_for = await element.get_attribute('for')
-                    if label_for:
-                        input_element = await self.page.wait_for_selector(
-                            f"#{label_for}",
-                            timeout=1000
-                        )
-                        if input_element:
-                            return input_element
-                    # Try finding input inside the label
-                    input_inside = await element.query_selector('input')
-                    if input_inside:
-                        return input_inside
-                    return element
-            except:
-                pass
-            
-            # Try common selectors for input fields
-            common_selectors = [
-                f"input[name*='{identifier}' i]",
-                f"input[id*='{identifier}' i]",
-                f"input[aria-label*='{identifier}' i]",
-                f"textarea[name*='{identifier}' i]",
-                f"textarea[id*='{identifier}' i]",
-                f"textarea[aria-label*='{identifier}' i]",
-                f"button:has-text('{identifier}')",
-                f"a:has-text('{identifier}')"
-            ]
-            
-            for selector in common_selectors:
-                try:
-                    element = await self.page.wait_for_selector(selector, timeout=1000)
-                    if element:
-                        return element
-                except:
-                    continue
+            element = await self._locate_element(page, identifier, timeout, fillable)
+            if element:
+                if cache is not None:
+                    selector = await element.evaluate(STABLE_SELECTOR_JS)
+                    if selector:
+                        cache[key] = selector
+                return element
             
             # If all strategies fail, raise an error
             raise ElementNotFoundError(f"Could not find element: {identifier}")
@@ -245,10 +555,42 @@ class BrowserController:
             logger.error(f"Error finding element '{identifier}': {str(e)}")
             raise ElementNotFoundError(f"Error finding element '{identifier}': {str(e)}")
     
-    async def _click(self, text: str) -> Dict[str, Any]:
+    async def _locate_element(self, page: Page, identifier, timeout, fillable=False) -> Optional[ElementHandle]:
+        """Run the lookup strategies for an identifier, returning None if nothing matches."""
+        quoted = _quote_css(identifier)
+        
+        # Fast path: exact text or any of the field selectors, resolved by a
+        # single query instead of one round-trip per strategy
+        locator = page.locator(FIELD_SELECTOR_TEMPLATE.format(id=quoted))
+        if not fillable:
+            locator = page.get_by_text(identifier, exact=True).or_(locator)
+        try:
+            element = await locator.locator("visible=true").first.element_handle(timeout=timeout)
+            if element:
+                return element
+        except PlaywrightTimeoutError:
+            pass
+        
+        # Slow path: find the input associated with a matching label, in one round-trip
+        handle = await page.evaluate_handle(FIND_BY_LABEL_JS, identifier)
+        element = handle.as_element()
+        if element:
+            return element
+        await handle.dispose()
+        
+        if fillable:
+            return None
+        
+        # Last resort: buttons and links containing the text. The wait above
+        # has already elapsed, so this is a plain query.
+        return await page.query_selector(
+            f"{TEXT_SELECTOR_TEMPLATE.format(id=quoted)} >> visible=true"
+        )
+    
+    async def _click(self, page: Page, text: str) -> Dict[str, Any]:
         """Click on an element containing the specified text."""
         try:
-            element = await self._find_element(text)
+            element = await self._find_element(page, text)
             await element.click()
             return {"clicked": text}
         except ElementNotFoundError:
@@ -257,13 +599,22 @@ class BrowserController:
             logger.error(f"Click error on '{text}': {str(e)}")
             raise BrowserAutomationError(f"Failed to click on '{text}': {str(e)}")
     
-    async def _type(self, text: str, field: str) -> Dict[str, Any]:
-        """Type text into a field."""
+    async def _type(self, page: Page, text: str, field: str, human_like: bool = False) -> Dict[str, Any]:
+        """
+        Type text into a field.
+        
+        By default the value is set in a single fill(); with human_like the
+        field is cleared and typed one key at a time, for pages that react
+        to individual keystrokes.
+        """
         try:
-            element = await self._find_element(field)
-            # Clear the field first
-            await element.fill("")
-            await element.type(text, delay=50)  # Type with a slight delay for realism
+            element = await self._find_element(page, field, fillable=True)
+            if human_like:
+                # Clear the field first
+                await element.fill("")
+                await element.type(text, delay=50)  # Type with a slight delay for realism
+            else:
+                await element.fill(text)
             return {"field": field, "typed": text}
         except ElementNotFoundError:
             raise
@@ -271,46 +622,36 @@ class BrowserController:
             logger.error(f"Type error in field '{field}': {str(e)}")
             raise BrowserAutomationError(f"Failed to type in field '{field}': {str(e)}")
     
-    async def _submit(self) -> Dict[str, Any]:
-        """Submit the current form."""
+    async def _submit(self, page: Page, wait_until: str = DEFAULT_WAIT_STATE) -> Dict[str, Any]:
+        """Submit the current form and wait for the given load state."""
         try:
-            # Try to find a submit button first
-            submit_selectors = [
-                "input[type='submit']",
-                "button[type='submit']",
-                "button:has-text('Submit')",
-                "button:has-text('Login')",
-                "button:has-text('Sign in')",
-                "button:has-text('Search')",
-                "button:has-text('Send')"
-            ]
+            # Try to click a submit button first, probing all candidates at once
+            try:
+                await page.locator(SUBMIT_SELECTOR).locator("visible=true").first.click(timeout=2000)
+                clicked = True
+            except PlaywrightTimeoutError:
+                clicked = False
             
-            for selector in submit_selectors:
-                try:
-                    submit_button = await self.page.wait_for_selector(selector, timeout=1000)
-                    if submit_button:
-                        await submit_button.click()
-                        await self.page.wait_for_load_state("networkidle")
-                        return {"submitted": True}
-                except:
-                    continue
+            if clicked:
+                await page.wait_for_load_state(wait_until)
+                return {"submitted": True}
             
             # If no submit button found, try pressing Enter on a form element
-            form = await self.page.query_selector("form")
+            form = await page.query_selector("form")
             if form:
                 await form.press("Enter")
-                await self.page.wait_for_load_state("networkidle")
+                await page.wait_for_load_state(wait_until)
                 return {"submitted": True}
             
             # If still not successful, try pressing Enter on the active element
-            await self.page.keyboard.press("Enter")
-            await self.page.wait_for_load_state("networkidle")
+            await page.keyboard.press("Enter")
+            await page.wait_for_load_state(wait_until)
             return {"submitted": True}
         except Exception as e:
             logger.error(f"Form submission error: {str(e)}")
             raise BrowserAutomationError(f"Failed to submit form: {str(e)}")
     
-    async def _wait(self, seconds: float) -> Dict[str, Any]:
+    async def _wait(self, page: Page, seconds: float) -> Dict[str, Any]:
         """Wait for a specified number of seconds."""
         try:
             await asyncio.sleep(seconds)
@@ -319,10 +660,10 @@ class BrowserController:
             logger.error(f"Wait error: {str(e)}")
             raise BrowserAutomationError(f"Failed to wait: {str(e)}")
     
-    async def _wait_for_element(self, element: str, timeout: int = 30000) -> Dict[str, Any]:
+    async def _wait_for_element(self, page: Page, element: str, timeout: int = 30000) -> Dict[str, Any]:
         """Wait for an element to appear on the page."""
         try:
-            await self._find_element(element, timeout=timeout)
+            await self._find_element(page, element, timeout=timeout)
             return {"waited_for": element}
         except ElementNotFoundError:
             raise TimeoutError(f"Timed out waiting for element: {element}")
@@ -330,10 +671,10 @@ class BrowserController:
             logger.error(f"Wait for element error: {str(e)}")
             raise BrowserAutomationError(f"Failed to wait for element: {str(e)}")
     
-    async def _screenshot(self) -> Dict[str, Any]:
+    async def _screenshot(self, page: Page) -> Dict[str, Any]:
         """Take a screenshot of the current page."""
         try:
-            screenshot_bytes = await self.page.screenshot()
+            screenshot_bytes = await page.screenshot()
             screenshot_base64 = base64.b64encode(screenshot_bytes).decode('utf-8')
             return {
                 "screenshot": screenshot_base64,
@@ -343,11 +684,67 @@ class BrowserController:
             logger.error(f"Screenshot error: {str(e)}")
             raise BrowserAutomationError(f"Failed to take screenshot: {str(e)}")
     
-    async def _login(self, website: str, username: Optional[str] = None, password: Optional[str] = None) -> Dict[str, Any]:
-        """Log in to a website."""
+    async def _restore_state(self, page: Page, path: str) -> bool:
+        """Load cookies saved by _save_state into the page's context, if any."""
+        if not os.path.exists(path):
+            return False
+        
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            cookies = state.get("cookies")
+            if cookies:
+                await page.context.add_cookies(cookies)
+            return bool(cookies)
+        except Exception as e:
+            logger.warning(f"Could not restore saved session from {path}: {str(e)}")
+            return False
+    
+    async def _save_state(self, page: Page, path: str, host: str):
+        """
+        Persist the site's cookies and local storage for later logins.
+        
+        The pooled context is shared with other sites and clients, so only
+        the cookies and origins belonging to host are written.
+        """
         try:
+            state = await page.context.storage_state()
+            state = {
+                "cookies": [c for c in state.get("cookies", []) if _on_site(c.get("domain"), host)],
+                "origins": [o for o in state.get("origins", []) if _on_site(urlsplit(o.get("origin", "")).hostname, host)]
+            }
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(state, f)
+        except Exception as e:
+            logger.warning(f"Could not save session to {path}: {str(e)}")
+    
+    async def _login(self, page: Page, website: str, username: Optional[str] = None, password: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Log in to a website.
+        
+        After a successful login with credentials the site's cookies are
+        saved per site and username. Later logins as the same user (or
+        without a username, using the latest session for the site) restore
+        them and skip the form when the site already shows a logged-in page.
+        """
+        try:
+            # Reuse the session saved by an earlier login to this site
+            host = _site_host(website)
+            state_path = _state_path(host, username) if username else _latest_state_path(host)
+            restored = bool(state_path) and await self._restore_state(page, state_path)
+            
             # Navigate to the website
-            await self._navigate(website)
+            await self._navigate(page, website)
+            
+            if restored and await page.evaluate(LOGGED_IN_JS, LOGIN_LINK_TEXTS):
+                logger.info(f"Reused saved session for {website}")
+                return {
+                    "logged_in": True,
+                    "website": website,
+                    "current_url": page.url,
+                    "session_restored": True
+                }
             
             # Look for login, sign in, or account links
             login_buttons = [
@@ -358,16 +755,16 @@ class BrowserController:
             # Try to find and click a login button
             for button_text in login_buttons:
                 try:
-                    login_button = await self.page.wait_for_selector(
+                    login_button = await page.wait_for_selector(
                         f"text='{button_text}'",
                         timeout=2000
                     )
                     if login_button:
                         await login_button.click()
                         # Wait for the page to settle
-                        await self.page.wait_for_load_state("networkidle")
+                        await page.wait_for_load_state(DEFAULT_WAIT_STATE)
                         break
-                except:
+                except Exception:
                     continue
             
             # If username and password are provided, try to fill the login form
@@ -380,10 +777,10 @@ class BrowserController:
                 username_filled = False
                 for field in username_fields:
                     try:
-                        await self._type(username, field)
+                        await self._type(page, username, field)
                         username_filled = True
                         break
-                    except:
+                    except Exception:
                         continue
                 
                 if not username_filled:
@@ -393,32 +790,39 @@ class BrowserController:
                 password_filled = False
                 for field in password_fields:
                     try:
-                        await self._type(password, field)
+                        await self._type(page, password, field)
                         password_filled = True
                         break
-                    except:
+                    except Exception:
                         continue
                 
                 if not password_filled:
                     raise ElementNotFoundError("Could not find password field")
                 
-                # Submit the form
-                await self._submit()
+                # Submit the form and keep the session only if it worked
+                await self._submit(page)
+                logged_in = await page.evaluate(LOGGED_IN_JS, LOGIN_LINK_TEXTS)
+                if logged_in:
+                    await self._save_state(page, state_path, host)
+                else:
+                    logger.warning(f"Still not logged in to {website} after submitting the form")
+            else:
+                logged_in = False
             
             return {
-                "logged_in": username is not None and password is not None,
+                "logged_in": logged_in,
                 "website": website,
-                "current_url": await self.page.url()
+                "current_url": page.url
             }
         except Exception as e:
             logger.error(f"Login error for {website}: {str(e)}")
             raise BrowserAutomationError(f"Failed to login to {website}: {str(e)}")
     
-    async def _search(self, query: str, website: str) -> Dict[str, Any]:
+    async def _search(self, page: Page, query: str, website: str) -> Dict[str, Any]:
         """Search for a query on a website."""
         try:
             # Navigate to the website
-            await self._navigate(website)
+            await self._navigate(page, website)
             
             # Common search field identifiers
             search_fields = ["search", "q", "query", "find"]
@@ -427,36 +831,35 @@ class BrowserController:
             search_filled = False
             for field in search_fields:
                 try:
-                    await self._type(query, field)
+                    await self._type(page, query, field)
                     search_filled = True
                     break
-                except:
+                except Exception:
                     continue
             
             if not search_filled:
                 # Try to find any visible search box
-                search_box = await self.page.wait_for_selector(
+                search_box = await page.wait_for_selector(
                     "input[type='search'], input[placeholder*='search' i], input[aria-label*='search' i]",
                     timeout=5000
                 )
                 if search_box:
-                    await search_box.fill("")
-                    await search_box.type(query, delay=50)
+                    await search_box.fill(query)
                     search_filled = True
             
             if not search_filled:
                 raise ElementNotFoundError("Could not find search field")
             
             # Submit the search
-            await self._submit()
+            await self._submit(page)
             
             # Wait for search results to load
-            await self.page.wait_for_load_state("networkidle")
+            await page.wait_for_load_state(DEFAULT_WAIT_STATE)
             
             return {
                 "search_query": query,
                 "website": website,
-                "current_url": await self.page.url()
+                "current_url": page.url
             }
         except Exception as e:
             logger.error(f"Search error for '{query}' on {website}: {str(e)}")
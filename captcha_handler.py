@@ -1,9 +1,10 @@
 # captcha_handler.py
 from typing import Optional, List, Tuple
 import logging
+import re
 from playwright.async_api import Page, ElementHandle
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import base64
-import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -22,26 +23,29 @@ class CaptchaHandler:
     3. Can pause automation for manual intervention when necessary
     """
     
-    # Common CAPTCHA selectors and patterns
+    # Common CAPTCHA selectors and patterns, in priority order, each with
+    # the CAPTCHA type reported when it matches
     CAPTCHA_SELECTORS = [
         # reCAPTCHA
-        "iframe[src*='recaptcha']",
-        "iframe[title*='recaptcha']",
-        ".g-recaptcha",
-        "div[data-sitekey]",
+        ("iframe[src*='recaptcha']", "recaptcha"),
+        ("iframe[title*='recaptcha']", "recaptcha"),
+        (".g-recaptcha", "recaptcha"),
         
         # hCaptcha
-        "iframe[src*='hcaptcha']",
-        ".h-captcha",
+        ("iframe[src*='hcaptcha']", "hcaptcha"),
+        (".h-captcha", "hcaptcha"),
+        
+        # Site key of a widget that did not match the more specific selectors
+        ("div[data-sitekey]", "recaptcha"),
         
         # Text-based CAPTCHAs
-        "img[alt*='captcha' i]",
-        "input[name*='captcha' i]",
-        "div[class*='captcha' i]",
+        ("img[alt*='captcha' i]", "text_captcha"),
+        ("input[name*='captcha' i]", "text_captcha"),
+        ("div[class*='captcha' i]", "text_captcha"),
         
         # Common captcha terms in various elements
-        "label:has-text('I am not a robot')",
-        "div:has-text('Verify you are human')"
+        ("label:has-text('I am not a robot')", "unknown"),
+        ("div:has-text('Verify you are human')", "unknown")
     ]
     
     # Text patterns that suggest CAPTCHA presence
@@ -54,6 +58,33 @@ class CaptchaHandler:
         "human verification"
     ]
     
+    # Precomputed once: the plain CSS selectors (usable with
+    # document.querySelector) in priority order, and all text patterns as one
+    # case-insensitive alternation scanned in a single pass. The :has-text
+    # selectors match every ancestor of their text, so they are left to the
+    # text scan, which covers the same phrases.
+    _ELEMENT_SELECTORS = [(s, t) for s, t in CAPTCHA_SELECTORS if ":has-text" not in s]
+    _CSS_SELECTORS = [s for s, _ in _ELEMENT_SELECTORS]
+    _TEXT_REGEX = "|".join(re.escape(p) for p in CAPTCHA_TEXT_PATTERNS)
+    
+    # Scans the rendered text in the page and returns the first match
+    _TEXT_SCAN_JS = """(source) => {
+        const match = new RegExp(source, 'i').exec(document.body ? document.body.innerText : '');
+        return match ? match[0] : null;
+    }"""
+    
+    # All CSS selectors as one selector list
+    _CSS_SELECTOR = ", ".join(_CSS_SELECTORS)
+    
+    # Index of the highest-priority selector present in the page, or -1
+    _FIND_JS = """(selectors) => selectors.findIndex(s => document.querySelector(s))"""
+    
+    # True once neither a CAPTCHA element nor a CAPTCHA text pattern is present
+    _SOLVED_JS = """([selector, source]) => {
+        if (document.querySelector(selector)) return false;
+        return !new RegExp(source, 'i').test(document.body ? document.body.innerText : '');
+    }"""
+    
     def __init__(self, page: Page, api_key: Optional[str] = None):
         """
         Initialize the CAPTCHA handler.
@@ -73,33 +104,21 @@ class CaptchaHandler:
             Tuple of (is_captcha_present, captcha_type, captcha_element)
         """
         try:
-            # Check for CAPTCHA elements using selectors
-            for selector in self.CAPTCHA_SELECTORS:
+            # Find the highest-priority CAPTCHA selector present, testing
+            # them in order inside the page with a single round-trip
+            index = await self.page.evaluate(self._FIND_JS, self._CSS_SELECTORS)
+            if index >= 0:
+                selector, captcha_type = self._ELEMENT_SELECTORS[index]
+                logger.info(f"CAPTCHA detected via selector match: {selector}")
                 element = await self.page.query_selector(selector)
-                if element:
-                    logger.info(f"CAPTCHA detected via selector: {selector}")
-                    
-                    # Determine CAPTCHA type
-                    captcha_type = "unknown"
-                    selector_text = selector.lower()
-                    
-                    if "recaptcha" in selector_text:
-                        captcha_type = "recaptcha"
-                    elif "hcaptcha" in selector_text:
-                        captcha_type = "hcaptcha"
-                    elif "captcha" in selector_text:
-                        captcha_type = "text_captcha"
-                        
-                    return True, captcha_type, element
-            
-            # Check for CAPTCHA text patterns
-            page_text = await self.page.content()
-            page_text_lower = page_text.lower()
+                return True, captcha_type, element
             
-            for pattern in self.CAPTCHA_TEXT_PATTERNS:
-                if pattern in page_text_lower:
-                    logger.info(f"CAPTCHA detected via text pattern: {pattern}")
-                    return True, "unknown", None
+            # Check for CAPTCHA text patterns inside the page, without
+            # serializing the document back to Python
+            pattern = await self.page.evaluate(self._TEXT_SCAN_JS, self._TEXT_REGEX)
+            if pattern:
+                logger.info(f"CAPTCHA detected via text pattern: {pattern}")
+                return True, "unknown", None
             
             return False, None, None
                 
@@ -186,19 +205,21 @@ class CaptchaHandler:
             wait_time = 30  # seconds
             logger.info(f"Waiting {wait_time} seconds for manual CAPTCHA solution...")
             
-            for i in range(wait_time):
-                # Check every second if we're past the CAPTCHA
-                is_captcha_present, _, _ = await self.detect_captcha()
-                if not is_captcha_present:
-                    logger.info("CAPTCHA appears to be solved")
-                    return True
-                
-                await asyncio.sleep(1)
-                if (i + 1) % 5 == 0:
-                    logger.info(f"Still waiting... {wait_time - i - 1} seconds remaining")
+            # Let the browser watch for the CAPTCHA to disappear instead of
+            # re-running the full detection from Python every second
+            try:
+                await self.page.wait_for_function(
+                    self._SOLVED_JS,
+                    arg=[self._CSS_SELECTOR, self._TEXT_REGEX],
+                    polling=250,
+                    timeout=wait_time * 1000
+                )
+            except PlaywrightTimeoutError:
+                logger.warning("Timeout waiting for manual CAPTCHA solution")
+                return False
             
-            logger.warning("Timeout waiting for manual CAPTCHA solution")
-            return False
+            logger.info("CAPTCHA appears to be solved")
+            return True
             
         except Exception as e:
             logger.error(f"Error during manual intervention: {str(e)}")
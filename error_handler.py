@@ -1,7 +1,7 @@
 # error_handler.py
 import logging
 import traceback
-from typing import Optional
+from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -12,43 +12,45 @@ class BrowserAutomationError(Exception):
         self.message = message
         self.details = details or {}
         super().__init__(message)
-        
-        # Log the error
-        logger.error(f"{self.__class__.__name__}: {message}")
-        if details:
-            logger.error(f"Error details: {details}")
 
 class ElementNotFoundError(BrowserAutomationError):
     """Exception raised when an element is not found."""
     
+    # Suggestions for recovery, shared by all instances
+    recovery_suggestions: Tuple[str, ...] = (
+        "Check if the element identifier is correct",
+        "Try waiting longer for the element to appear",
+        "The page structure might have changed",
+    )
+    
     def __init__(self, message: str, element_identifier: Optional[str] = None):
         details = {"element_identifier": element_identifier} if element_identifier else {}
         super().__init__(message, details)
-        
-        # Provide suggestions for recovery
-        self.recovery_suggestions = [
-            "Check if the element identifier is correct",
-            "Try waiting longer for the element to appear",
-            "The page structure might have changed"
-        ]
 
 class NavigationError(BrowserAutomationError):
     """Exception raised when navigation fails."""
     
+    # Suggestions for recovery, shared by all instances
+    recovery_suggestions: Tuple[str, ...] = (
+        "Check if the URL is correct and accessible",
+        "Verify your internet connection",
+        "The website might be down or blocking automated access",
+    )
+    
     def __init__(self, message: str, url: Optional[str] = None):
         details = {"url": url} if url else {}
         super().__init__(message, details)
-        
-        # Provide suggestions for recovery
-        self.recovery_suggestions = [
-            "Check if the URL is correct and accessible",
-            "Verify your internet connection",
-            "The website might be down or blocking automated access"
-        ]
 
 class TimeoutError(BrowserAutomationError):
     """Exception raised when an operation times out."""
     
+    # Suggestions for recovery, shared by all instances
+    recovery_suggestions: Tuple[str, ...] = (
+        "Try increasing the timeout value",
+        "Check if the page is loading slowly",
+        "The operation might be blocked by the website",
+    )
+    
     def __init__(self, message: str, operation: Optional[str] = None, timeout_ms: Optional[int] = None):
         details = {}
         if operation:
@@ -56,55 +58,48 @@ class TimeoutError(BrowserAutomationError):
         if timeout_ms:
             details["timeout_ms"] = timeout_ms
         super().__init__(message, details)
-        
-        # Provide suggestions for recovery
-        self.recovery_suggestions = [
-            "Try increasing the timeout value",
-            "Check if the page is loading slowly",
-            "The operation might be blocked by the website"
-        ]
 
 class AuthenticationError(BrowserAutomationError):
     """Exception raised when authentication fails."""
     
+    # Suggestions for recovery, shared by all instances
+    recovery_suggestions: Tuple[str, ...] = (
+        "Verify your credentials",
+        "Check if the website requires two-factor authentication",
+        "The website might have anti-bot measures in place",
+    )
+    
     def __init__(self, message: str, website: Optional[str] = None):
         details = {"website": website} if website else {}
         super().__init__(message, details)
-        
-        # Provide suggestions for recovery
-        self.recovery_suggestions = [
-            "Verify your credentials",
-            "Check if the website requires two-factor authentication",
-            "The website might have anti-bot measures in place"
-        ]
 
 class InvalidCommandError(BrowserAutomationError):
     """Exception raised when a command is invalid or cannot be parsed."""
     
+    # Suggestions for recovery, shared by all instances
+    recovery_suggestions: Tuple[str, ...] = (
+        "Check the command syntax",
+        "See documentation for supported commands",
+        "Try rephrasing the command",
+    )
+    
     def __init__(self, message: str, command: Optional[str] = None):
         details = {"command": command} if command else {}
         super().__init__(message, details)
-        
-        # Provide suggestions for recovery
-        self.recovery_suggestions = [
-            "Check the command syntax",
-            "See documentation for supported commands",
-            "Try rephrasing the command"
-        ]
 
 class BrowserInitializationError(BrowserAutomationError):
     """Exception raised when the browser fails to initialize."""
     
+    # Suggestions for recovery, shared by all instances
+    recovery_suggestions: Tuple[str, ...] = (
+        "Check if the browser is installed and accessible",
+        "Verify that no other instances are running that might cause conflicts",
+        "Try restarting the application",
+    )
+    
     def __init__(self, message: str, browser_type: Optional[str] = None):
         details = {"browser_type": browser_type} if browser_type else {}
         super().__init__(message, details)
-        
-        # Provide suggestions for recovery
-        self.recovery_suggestions = [
-            "Check if the browser is installed and accessible",
-            "Verify that no other instances are running that might cause conflicts",
-            "Try restarting the application"
-        ]
 
 def handle_error(error: Exception) -> dict:
     """
@@ -116,15 +111,24 @@ def handle_error(error: Exception) -> dict:
     Returns:
         A dictionary with error details
     """
-    if isinstance(error, BrowserAutomationError):
+    cls = type(error)
+    if issubclass(cls, BrowserAutomationError):
         response = {
-            "error_type": error.__class__.__name__,
+            "error_type": cls.__name__,
             "message": error.message,
             "details": error.details
         }
         
-        if hasattr(error, "recovery_suggestions"):
-            response["recovery_suggestions"] = error.recovery_suggestions
+        # Looked up on the class, where subclasses define their suggestions
+        suggestions = getattr(cls, "recovery_suggestions", None)
+        if suggestions is not None:
+            response["recovery_suggestions"] = suggestions
+        
+        # Errors are logged here, once, rather than when they are raised
+        if error.details:
+            logger.error(f"{cls.__name__}: {error.message} (details: {error.details})")
+        else:
+            logger.error(f"{cls.__name__}: {error.message}")
             
         return response
     else:
@@ -135,4 +139,4 @@ def handle_error(error: Exception) -> dict:
             "details": {
                 "traceback": traceback.format_exc()
             }
-        }
\ No newline at end of file
+        }
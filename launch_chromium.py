@@ -0,0 +1,65 @@
+# launch_chromium.py
+"""
+Launch a single headless Chromium with remote debugging enabled so that
+several API workers can share it via CDP_ENDPOINT.
+
+Usage:
+    python launch_chromium.py [port]
+
+Prints an ``export CDP_ENDPOINT=...`` line once the browser is ready and
+then keeps running until the browser exits (or Ctrl-C).
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.error import URLError
+
+from playwright.sync_api import sync_playwright
+
+DEFAULT_PORT = 9222
+STARTUP_TIMEOUT = 15  # seconds
+
+def chromium_executable() -> str:
+    """Return the Chromium binary to launch (CHROMIUM_PATH or Playwright's bundled one)."""
+    path = os.getenv("CHROMIUM_PATH")
+    if path:
+        return path
+    with sync_playwright() as p:
+        return p.chromium.executable_path
+
+def wait_for_ws_endpoint(port: int, timeout: float = STARTUP_TIMEOUT) -> str:
+    """Poll the DevTools HTTP endpoint until it reports the browser WebSocket URL."""
+    url = f"http://127.0.0.1:{port}/json/version"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url) as response:
+                return json.load(response)["webSocketDebuggerUrl"]
+        except (URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Chromium did not expose a DevTools endpoint on port {port}")
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    process = subprocess.Popen([
+        chromium_executable(),
+        f"--remote-debugging-port={port}",
+        "--headless=new",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ])
+    try:
+        ws_endpoint = wait_for_ws_endpoint(port)
+        print(f"export CDP_ENDPOINT={ws_endpoint}", flush=True)
+        process.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        process.terminate()
+        process.wait()
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,178 @@
 # parser.py
 import re
-from typing import Tuple, Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Define command patterns
-COMMAND_PATTERNS = [
+@dataclass(frozen=True)
+class CommandParams:
+    """
+    Parameters parsed from a command.
+    
+    Instances are immutable, so cached parses can be shared between callers,
+    and read like a mapping of parameter names to values, so they can be
+    passed on with dict(params) or **params.
+    """
+    __slots__ = ()
+    
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+@dataclass(frozen=True)
+class NavigateParams(CommandParams):
+    __slots__ = ("url",)
+    url: str
+    
+    def __post_init__(self):
+        if not self.url.startswith(('http://', 'https://')):
+            object.__setattr__(self, "url", f"https://{self.url}")
+
+@dataclass(frozen=True)
+class ClickParams(CommandParams):
+    __slots__ = ("text",)
+    text: str
+
+@dataclass(frozen=True)
+class TypeParams(CommandParams):
+    __slots__ = ("text", "field")
+    text: str
+    field: str
+
+@dataclass(frozen=True)
+class WaitParams(CommandParams):
+    __slots__ = ("seconds",)
+    seconds: float
+    
+    def __post_init__(self):
+        # Parsed commands pass the matched text
+        object.__setattr__(self, "seconds", float(self.seconds))
+
+@dataclass(frozen=True)
+class WaitForElementParams(CommandParams):
+    __slots__ = ("element",)
+    element: str
+
+@dataclass(frozen=True)
+class LoginParams(CommandParams):
+    __slots__ = ("website", "username", "password")
+    website: str
+    username: Optional[str]
+    password: Optional[str]
+
+@dataclass(frozen=True)
+class SearchParams(CommandParams):
+    __slots__ = ("query", "website")
+    query: str
+    website: str
+
+# Shared by the commands that take no parameters
+NO_PARAMS = CommandParams()
+
+# Define command patterns as (verbs, pattern, action, params_class). verbs are
+# the first words a matching command can start with ("fill in" is keyed on
+# "fill"), and the pattern's named groups are the params_class fields.
+_RAW_PATTERNS = [
     # Navigation
-    (r"(?:go to|navigate to|open) (?:the )?(?:website |site |page )?(?:at )?(?:https?://)?([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:/\S*)?)", 
-     "navigate", lambda m: {"url": f"https://{m.group(1)}" if not m.group(1).startswith(('http://', 'https://')) else m.group(1)}),
+    (("go", "navigate", "open"), r"(?:go to|navigate to|open) (?:the )?(?:website |site |page )?(?:at )?(?:https?://)?(?P<url>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:/\S*)?)", 
+     "navigate", NavigateParams),
     
     # Clicking
-    (r"click(?: on)? (?:the )?(?:button|link|element)(?: (?:with|that says|containing))? ['\"]([^'\"]+)['\"]", 
-     "click", lambda m: {"text": m.group(1)}),
-    (r"click(?: on)? (?:the )?([a-zA-Z0-9 ]+) (?:button|link|element)", 
-     "click", lambda m: {"text": m.group(1)}),
+    (("click",), r"click(?: on)? (?:the )?(?:button|link|element)(?: (?:with|that says|containing))? ['\"](?P<text>[^'\"]+)['\"]", 
+     "click", ClickParams),
+    (("click",), r"click(?: on)? (?:the )?(?P<text>[a-zA-Z0-9 ]+) (?:button|link|element)", 
+     "click", ClickParams),
     
     # Form input
-    (r"(?:type|enter|input|fill in) ['\"]([^'\"]+)['\"] (?:in(?:to)?|on) (?:the )?([a-zA-Z0-9 ]+)(?: field| input| box)?", 
-     "type", lambda m: {"text": m.group(1), "field": m.group(2)}),
-    (r"(?:type|enter|input|fill in) ([a-zA-Z0-9 ]+) (?:in(?:to)?|on) (?:the )?([a-zA-Z0-9 ]+)(?: field| input| box)?", 
-     "type", lambda m: {"text": m.group(1), "field": m.group(2)}),
-    
-    # Form submission
-    (r"(?:submit|send)(?: the)?(?: form)?", 
-     "submit", lambda m: {}),
+    (("type", "enter", "input", "fill"), r"(?:type|enter|input|fill in) ['\"](?P<text>[^'\"]+)['\"] (?:in(?:to)?|on) (?:the )?(?P<field>[a-zA-Z0-9 ]+)(?: field| input| box)?", 
+     "type", TypeParams),
+    (("type", "enter", "input", "fill"), r"(?:type|enter|input|fill in) (?P<text>[a-zA-Z0-9 ]+) (?:in(?:to)?|on) (?:the )?(?P<field>[a-zA-Z0-9 ]+)(?: field| input| box)?", 
+     "type", TypeParams),
     
     # Waiting
-    (r"wait (?:for )?([\d.]+) seconds?", 
-     "wait", lambda m: {"seconds": float(m.group(1))}),
-    (r"wait for(?: the)? ([a-zA-Z0-9 ]+)(?: to appear| to load)?", 
-     "wait_for_element", lambda m: {"element": m.group(1)}),
-    
-    # Take screenshot
-    (r"(?:take a |capture |grab a )?screenshot", 
-     "screenshot", lambda m: {}),
-    
-    # Login command (special case)
-    (r"log(?:in)?(?: to| into) ([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(?: with username ['\"]([^'\"]+)['\"] and password ['\"]([^'\"]+)['\"])?", 
-     "login", lambda m: {
-         "website": m.group(1),
-         "username": m.group(2) if len(m.groups()) > 1 and m.group(2) else None,
-         "password": m.group(3) if len(m.groups()) > 2 and m.group(3) else None
-     }),
+    (("wait",), r"wait (?:for )?(?P<seconds>[\d.]+) seconds?", 
+     "wait", WaitParams),
+    (("wait",), r"wait for(?: the)? (?P<element>[a-zA-Z0-9 ]+)(?: to appear| to load)?", 
+     "wait_for_element", WaitForElementParams),
+    
+    # Login command (special case); the credential groups are None when omitted
+    (("log", "login"), r"log(?:in)?(?: to| into) (?P<website>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(?: with username ['\"](?P<username>[^'\"]+)['\"] and password ['\"](?P<password>[^'\"]+)['\"])?", 
+     "login", LoginParams),
     
     # Search command (special case)
-    (r"search (?:for )?['\"]([^'\"]+)['\"] (?:on|in) ([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", 
-     "search", lambda m: {"query": m.group(1), "website": m.group(2)}),
+    (("search",), r"search (?:for )?['\"](?P<query>[^'\"]+)['\"] (?:on|in) (?P<website>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", 
+     "search", SearchParams),
 ]
 
-def parse_command(command: str) -> Tuple[str, Dict[str, Any]]:
+# Commands without parameters, recognised by their first word or opening
+# phrase without running a regex
+_FIXED_VERBS = {"submit": "submit", "send": "submit", "screenshot": "screenshot"}
+_SCREENSHOT_PHRASES = ("take a screenshot", "capture screenshot", "grab a screenshot")
+
+# Compiled once; commands are lowercased before matching, so no
+# case-insensitive flag is needed
+_COMPILED_PATTERNS = [
+    (verbs, (re.compile(pattern).match, action, params_class))
+    for verbs, pattern, action, params_class in _RAW_PATTERNS
+]
+
+# First word of a command -> (bound match method, action, params_class) for
+# the patterns that can start with it, in pattern order
+_VERB_MATCHERS = {
+    verb: tuple(matcher for verbs, matcher in _COMPILED_PATTERNS if verb in verbs)
+    for verb in {verb for verbs, _ in _COMPILED_PATTERNS for verb in verbs}
+}
+
+@lru_cache(maxsize=1024)
+def _match_command(command: str) -> Optional[Tuple[str, CommandParams]]:
+    """
+    Match a normalized command against the patterns.
+    
+    Results are cached; the parameters are immutable, so sharing is safe.
+    
+    Args:
+        command: The stripped, lowercased command
+        
+    Returns:
+        A tuple of (action, parameters), or None if no pattern matches
+    """
+    verb = command.partition(" ")[0]
+    
+    # Submitting and taking screenshots take no parameters
+    action = _FIXED_VERBS.get(verb)
+    if action is None and command.startswith(_SCREENSHOT_PHRASES):
+        action = "screenshot"
+    if action:
+        return action, NO_PARAMS
+    
+    # Only the patterns for the command's first word can match, so unknown
+    # verbs are rejected without running any regex
+    for match_pattern, action, params_class in _VERB_MATCHERS.get(verb, ()):
+        match = match_pattern(command)
+        if match:
+            return action, params_class(**match.groupdict())
+    
+    return None
+
+def parse_command(command: str) -> Tuple[str, CommandParams]:
     """
     Parse a natural language command into an action and parameters.
     
+    Repeated commands are answered from a cache of previous parses.
+    
     Args:
         command: The natural language command to parse
         
     Returns:
-        A tuple of (action, parameters)
+        A tuple of (action, parameters), with the parameters as a read-only
+        CommandParams mapping
         
     Raises:
         ValueError: If the command cannot be parsed
@@ -66,17 +180,14 @@ def parse_command(command: str) -> Tuple[str, Dict[str, Any]]:
     command = command.strip().lower()
     logger.info(f"Parsing command: {command}")
     
-    # Try each pattern until one matches
-    for pattern, action, param_extractor in COMMAND_PATTERNS:
-        match = re.match(pattern, command, re.IGNORECASE)
-        if match:
-            params = param_extractor(match)
-            logger.info(f"Matched action: {action} with params: {params}")
-            return action, params
+    result = _match_command(command)
+    if result is None:
+        logger.warning(f"No pattern matched for command: {command}")
+        raise ValueError(f"Could not understand command: {command}")
     
-    # If we get here, no pattern matched
-    logger.warning(f"No pattern matched for command: {command}")
-    raise ValueError(f"Could not understand command: {command}")
+    action, params = result
+    logger.info(f"Matched action: {action} with params: {params}")
+    return action, params
 
 # Examples of usage (for testing)
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+# waits.py
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Polling interval bounds in seconds: start fast, back off to at most MAX_INTERVAL
+INITIAL_INTERVAL = 0.1
+MAX_INTERVAL = 2.0
+
+async def _check(page, predicate: Callable[[Any], Any]) -> bool:
+    """Evaluate a sync or async predicate, treating errors as "not yet"."""
+    try:
+        result = predicate(page)
+        if inspect.isawaitable(result):
+            result = await result
+        return bool(result)
+    except Exception as e:
+        # e.g. the execution context was destroyed by a navigation in progress
+        logger.debug(f"Wait predicate raised: {str(e)}")
+        return False
+
+async def wait_for(page, predicate: Callable[[Any], Any], timeout: float = 30.0) -> bool:
+    """
+    Wait until predicate(page) is truthy, polling with exponential backoff.
+    
+    The predicate is checked immediately, then after intervals that start at
+    INITIAL_INTERVAL and double up to MAX_INTERVAL, so fast pages return
+    almost at once while slow pages are not polled aggressively. The last
+    check happens right at the deadline.
+    
+    Args:
+        page: The Playwright page passed to the predicate
+        predicate: Callable taking the page and returning a bool or an
+            awaitable bool (e.g. lambda p: p.evaluate("..."))
+        timeout: Maximum time to wait in seconds
+    
+    Returns:
+        True if the predicate was satisfied, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    interval = INITIAL_INTERVAL
+    
+    if await _check(page, predicate):
+        return True
+    
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        
+        # The last sleep is clipped to the deadline, so the check after it
+        # is the final forced check
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * 2, MAX_INTERVAL)
+        
+        if await _check(page, predicate):
+            return True
+    
+    logger.warning(f"Timed out after {timeout}s waiting for condition")
+    return False